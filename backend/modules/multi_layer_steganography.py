@@ -7,16 +7,48 @@ Supports multiple hidden messages/files with same or different passwords
 import os
 import json
 import hashlib
+import mmap
 import base64
 import struct
 import zipfile
 import tempfile
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, Union, Tuple, List
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.backends import default_backend
+
+# Little-endian uint32 length fields of the layer format
+_U32 = struct.Struct('<I')
+
+# Optional dependency for a faster PBKDF2-HMAC-SHA256 (same API as hashlib.pbkdf2_hmac)
+try:
+    from fastpbkdf2 import pbkdf2_hmac
+    HAS_FASTPBKDF2 = True
+except ImportError:
+    from hashlib import pbkdf2_hmac
+    HAS_FASTPBKDF2 = False
+
+# PBKDF2 iteration count for layers whose metadata doesn't record one
+DEFAULT_KDF_ITERATIONS = 100000
+
+# Accepted PBKDF2 iteration range; the count is read from the (untrusted) carrier on extract
+MIN_KDF_ITERATIONS = 10000
+MAX_KDF_ITERATIONS = 2000000
+
+def _validate_kdf_iterations(iterations) -> int:
+    """Return iterations if it is an int within [MIN_KDF_ITERATIONS, MAX_KDF_ITERATIONS], else raise ValueError"""
+    if type(iterations) is not int or not MIN_KDF_ITERATIONS <= iterations <= MAX_KDF_ITERATIONS:
+        raise ValueError(f"Invalid PBKDF2 iteration count {iterations!r} "
+                         f"(expected an integer from {MIN_KDF_ITERATIONS} to {MAX_KDF_ITERATIONS})")
+    return iterations
+
+def _derive_key(password: bytes, salt: bytes, iterations: int = DEFAULT_KDF_ITERATIONS) -> bytes:
+    """Derive the AES key for a password/salt pair"""
+    return pbkdf2_hmac('sha256', password, salt, iterations, 32)
+
+# ASCII control bytes that are neither printable nor whitespace (str.isprintable/isspace)
+_CONTROL_BYTES = bytes(b for b in range(32) if not chr(b).isspace()) + b'\x7f'
 
 def _is_likely_text_content(data):
     """Check if data is likely to be text content that can be safely decoded"""
@@ -26,16 +58,93 @@ def _is_likely_text_content(data):
     try:
         # Try to decode a sample to see if it's text
         sample = data[:min(1000, len(data))]
-        decoded = sample.decode('utf-8', errors='strict')
+        sample.decode('utf-8', errors='strict')
         
-        # Check if it contains mostly printable characters
-        printable_chars = sum(1 for c in decoded if c.isprintable() or c.isspace())
-        ratio = printable_chars / len(decoded) if decoded else 0
+        # Check if it contains mostly printable characters (count at byte level in C)
+        printable_bytes = len(sample.translate(None, _CONTROL_BYTES))
+        ratio = printable_bytes / len(sample)
         
         return ratio > 0.8  # 80% printable characters
     except (UnicodeDecodeError, UnicodeError):
         return False
 
+def _zip_family_name(data_bytes):
+    # Could be ZIP, DOCX, XLSX, etc.
+    head = bytes(data_bytes[:1024])
+    if b'word/' in head:
+        return "extracted_document.docx"
+    elif b'xl/' in head:
+        return "extracted_document.xlsx"
+    return "extracted_archive.zip"
+
+def _riff_name(data_bytes):
+    head = bytes(data_bytes[:20])
+    if b'WAVE' in head:
+        return "extracted_audio.wav"
+    elif b'AVI ' in head:
+        return "extracted_video.avi"
+    return None
+
+def _ftyp_video_name(data_bytes):
+    # Check specific MP4 variants
+    head = bytes(data_bytes[:50])
+    if b'mp41' in head or b'mp42' in head or b'isom' in head:
+        return "extracted_video.mp4"
+    elif b'M4V' in head:
+        return "extracted_video.m4v"
+    elif b'qt' in head:
+        return "extracted_video.mov"
+    return "extracted_video.mp4"  # Default to mp4
+
+# File signature -> filename, or a callable for prefixes shared by several formats
+# (returning None falls through to the text check)
+_MAGIC_TABLE = {
+    # Images / documents
+    b'\x89PNG\r\n\x1a\n': "extracted_image.png",
+    b'\xFF\xD8\xFF': "extracted_image.jpg",
+    b'GIF8': "extracted_image.gif",
+    b'%PDF': "extracted_document.pdf",
+    b'PK\x03\x04': _zip_family_name,
+    b'RIFF': _riff_name,
+    # Audio formats
+    b'ID3': "extracted_audio.mp3",
+    b'\xFF\xFB': "extracted_audio.mp3",
+    b'\xFF\xFA': "extracted_audio.mp3",
+    b'fLaC': "extracted_audio.flac",
+    b'OggS': "extracted_audio.ogg",
+    b'\xFF\xF1': "extracted_audio.aac",
+    b'\xFF\xF9': "extracted_audio.aac",
+    b'\x00\x00\x00\x20ftypM4A': "extracted_audio.m4a",
+    b'\x30\x26\xB2\x75\x8E\x66\xCF\x11': "extracted_audio.wma",  # ASF header, also used by WMV
+    # Video formats
+    b'\x00\x00\x00\x18ftyp': _ftyp_video_name,
+    b'\x00\x00\x00\x20ftyp': _ftyp_video_name,
+    b'\x1A\x45\xDF\xA3': "extracted_video.mkv",  # EBML header, also used by WebM
+    b'FLV\x01': "extracted_video.flv",
+}
+_MAGIC_LENGTHS = sorted({len(sig) for sig in _MAGIC_TABLE}, reverse=True)
+
+# Detected formats that are already compressed; DEFLATE only burns CPU on these
+_INCOMPRESSIBLE_EXTS = {
+    '.png', '.jpg', '.gif', '.zip', '.docx', '.xlsx',
+    '.mp3', '.flac', '.ogg', '.aac', '.m4a', '.wma',
+    '.mp4', '.m4v', '.mov', '.mkv', '.flv',
+}
+
+def _starts_with_ascii_text(data_bytes, num_chars=100):
+    """True if the first num_chars decoded characters are ASCII or whitespace.
+    
+    Decodes only a growing prefix instead of the whole payload; with errors='ignore'
+    the prefix decodes to a prefix of the full text, so the answer is the same.
+    """
+    size = num_chars * 4
+    while True:
+        decoded = bytes(data_bytes[:size]).decode('utf-8', errors='ignore')[:num_chars]
+        if len(decoded) == num_chars or size >= len(data_bytes):
+            break
+        size *= 4
+    return decoded.isascii() or all(ord(c) < 128 or c.isspace() for c in decoded)
+
 def detect_filename_from_content(data):
     """Detect appropriate filename and extension based on file content"""
     if not data:
@@ -50,79 +159,34 @@ def detect_filename_from_content(data):
     else:
         data_bytes = data
     
-    # Check for common file signatures
-    if data_bytes.startswith(b'\x89PNG\r\n\x1a\n'):
-        return "extracted_image.png"
-    elif data_bytes.startswith(b'\xFF\xD8\xFF'):
-        return "extracted_image.jpg"
-    elif data_bytes.startswith(b'GIF8'):
-        return "extracted_image.gif"
-    elif data_bytes.startswith(b'%PDF'):
-        return "extracted_document.pdf"
-    elif data_bytes.startswith(b'PK\x03\x04'):
-        # Could be ZIP, DOCX, XLSX, etc.
-        if b'word/' in data_bytes[:1024]:
-            return "extracted_document.docx"
-        elif b'xl/' in data_bytes[:1024]:
-            return "extracted_document.xlsx"
-        else:
-            return "extracted_archive.zip"
-    # Audio formats
-    elif data_bytes.startswith(b'RIFF') and b'WAVE' in data_bytes[:20]:
-        return "extracted_audio.wav"
-    elif data_bytes.startswith(b'ID3') or data_bytes.startswith(b'\xFF\xFB') or data_bytes.startswith(b'\xFF\xFA'):
-        return "extracted_audio.mp3"
-    elif data_bytes.startswith(b'fLaC'):
-        return "extracted_audio.flac"
-    elif data_bytes.startswith(b'OggS'):
-        return "extracted_audio.ogg"
-    elif data_bytes.startswith(b'\xFF\xF1') or data_bytes.startswith(b'\xFF\xF9'):
-        return "extracted_audio.aac"
-    elif data_bytes.startswith(b'\x00\x00\x00\x20ftypM4A'):
-        return "extracted_audio.m4a"
-    elif data_bytes.startswith(b'\x30\x26\xB2\x75\x8E\x66\xCF\x11'):
-        return "extracted_audio.wma"
+    # Check for common file signatures, longest prefix first
+    for length in _MAGIC_LENGTHS:
+        match = _MAGIC_TABLE.get(bytes(data_bytes[:length]))
+        if match is not None:
+            name = match(data_bytes) if callable(match) else match
+            if name:
+                return name
+            break
     
-    # Video formats
-    elif (data_bytes.startswith(b'\x00\x00\x00\x18ftyp') or 
-          data_bytes.startswith(b'\x00\x00\x00\x20ftyp')):
-        # Check specific MP4 variants
-        if b'mp41' in data_bytes[:50] or b'mp42' in data_bytes[:50] or b'isom' in data_bytes[:50]:
-            return "extracted_video.mp4"
-        elif b'M4V' in data_bytes[:50]:
-            return "extracted_video.m4v"
-        elif b'qt' in data_bytes[:50]:
-            return "extracted_video.mov"
+    # Check if it looks like text content
+    try:
+        if isinstance(data, str):
+            return "extracted_text.txt"
         else:
-            return "extracted_video.mp4"  # Default to mp4
-    elif data_bytes.startswith(b'RIFF') and b'AVI ' in data_bytes[:20]:
-        return "extracted_video.avi"
-    elif data_bytes.startswith(b'\x1A\x45\xDF\xA3'):
-        return "extracted_video.mkv"
-    elif data_bytes.startswith(b'\x30\x26\xB2\x75\x8E\x66\xCF\x11'):
-        return "extracted_video.wmv"
-    elif data_bytes.startswith(b'FLV\x01'):
-        return "extracted_video.flv"
-    elif data_bytes.startswith(b'\x1A\x45\xDF\xA3') and b'webm' in data_bytes[:100]:
-        return "extracted_video.webm"
-    else:
-        # Check if it looks like text content
-        try:
-            if isinstance(data, str):
+            if _starts_with_ascii_text(data_bytes):  # ASCII-like content
                 return "extracted_text.txt"
-            else:
-                decoded = data_bytes.decode('utf-8', errors='ignore')
-                if all(ord(c) < 128 or c.isspace() for c in decoded[:100]):  # ASCII-like content
-                    return "extracted_text.txt"
-        except:
-            pass
+    except:
+        pass
     
     return "extracted_file.bin"
 
 class MultiLayerSteganography:
     """Advanced multi-layer steganography supporting multiple hidden messages"""
     
-    def __init__(self):
+    def __init__(self, kdf_iterations: int = DEFAULT_KDF_ITERATIONS):
+        # PBKDF2 cost for new encrypted layers (recorded per layer, so changing it never breaks old ones)
+        self.kdf_iterations = _validate_kdf_iterations(kdf_iterations)
+        
         # Version-based magic headers for layered embedding
         self.magic_headers = {
             1: b"VEILFORGE_LAYER_V1_SAFE",
@@ -147,6 +211,13 @@ class MultiLayerSteganography:
         # Legacy compatibility
         self.legacy_magic = b"VEILFORGE_UNIVERSAL_SAFE_V2"
         self.legacy_end = b"VEILFORGE_UNIVERSAL_END_V2"
+        
+        # Every marker starts with this prefix; maps each layer magic to (layer_number, end_marker)
+        self.marker_prefix = b"VEILFORGE_"
+        self._layer_magics = {self.legacy_magic: (0, self.legacy_end)}
+        for version, magic_header in self.magic_headers.items():
+            self._layer_magics[magic_header] = (version, self.end_markers[version])
+        self._scan_targets = tuple(self._layer_magics) + (self.layer_index_magic,)
     
     def hide_data(self, carrier_file_path: str, content_to_hide: Union[str, bytes], 
                   output_path: str, password: Optional[str] = None, 
@@ -155,12 +226,17 @@ class MultiLayerSteganography:
         
         print(f"[MULTI-LAYER] Processing {os.path.basename(carrier_file_path)}")
         
-        # Read carrier file (might already contain hidden layers)
-        with open(carrier_file_path, 'rb') as f:
-            file_data = f.read()
+        # Map carrier file (might already contain hidden layers) so only touched pages are read.
+        # Overwriting it in place would truncate a mapped file, so read it into memory then.
+        if os.path.exists(output_path) and os.path.samefile(carrier_file_path, output_path):
+            file_data, carrier_hash = self._read_carrier(carrier_file_path)
+        else:
+            file_data = self._map_carrier(carrier_file_path)
+            carrier_hash = hashlib.sha256(file_data).hexdigest()[:16]
         
-        # Detect existing layers
-        existing_layers = self._detect_existing_layers(file_data)
+        # Detect existing layers (and the old layer index) in one pass over the carrier
+        marker_positions = self._scan_markers(file_data)
+        existing_layers = self._detect_existing_layers(file_data, marker_positions)
         next_layer_number = len(existing_layers) + 1
         
         print(f"[MULTI-LAYER] Found {len(existing_layers)} existing layers")
@@ -196,38 +272,69 @@ class MultiLayerSteganography:
                 filename = base_name
         
         return self._embed_new_layer(file_data, original_payload, output_path, 
-                                   password, filename, file_ext, next_layer_number, existing_layers)
+                                   password, filename, file_ext, next_layer_number, existing_layers,
+                                   carrier_hash=carrier_hash,
+                                   index_pos=marker_positions.get(self.layer_index_magic, -1))
     
-    def _detect_existing_layers(self, file_data: bytes) -> List[Dict[str, Any]]:
+    def _map_carrier(self, carrier_file_path: str) -> Union[mmap.mmap, bytes]:
+        """Memory-map the carrier read-only; unmapped once the returned object is released"""
+        with open(carrier_file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b''  # Empty files can't be mapped
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def _read_carrier(self, carrier_file_path: str, chunk_size: int = 1 << 20) -> Tuple[bytearray, str]:
+        """Read the carrier and compute its binding hash in one pass (each chunk is hashed while cache-hot)"""
+        digest = hashlib.sha256()
+        file_data = bytearray(os.path.getsize(carrier_file_path))
+        view = memoryview(file_data)
+        
+        with open(carrier_file_path, 'rb') as f:
+            pos = 0
+            while pos < len(file_data):
+                read = f.readinto(view[pos:pos + chunk_size])
+                if not read:
+                    break
+                digest.update(view[pos:pos + read])
+                pos += read
+        
+        view.release()
+        del file_data[pos:]  # File shrank while reading
+        return file_data, digest.hexdigest()[:16]
+    
+    def _scan_markers(self, file_data: bytes) -> Dict[bytes, int]:
+        """Find the first position of every layer magic and the layer index magic in one pass"""
+        positions = {}
+        
+        # Single pass over the shared marker prefix instead of one full-file find per marker
+        pos = file_data.find(self.marker_prefix)
+        while pos != -1 and len(positions) < len(self._scan_targets):
+            for marker in self._scan_targets:
+                if marker not in positions and file_data[pos:pos + len(marker)] == marker:
+                    positions[marker] = pos
+                    break
+            pos = file_data.find(self.marker_prefix, pos + 1)
+        
+        return positions
+    
+    def _detect_existing_layers(self, file_data: bytes,
+                                marker_positions: Optional[Dict[bytes, int]] = None) -> List[Dict[str, Any]]:
         """Detect all existing hidden layers in the file"""
         layers = []
-        
-        # Check for legacy format first
-        legacy_pos = file_data.find(self.legacy_magic)
-        if legacy_pos != -1:
-            layer_info = {
-                'layer_number': 0,  # Legacy layer
-                'magic_pos': legacy_pos,
-                'magic_header': self.legacy_magic,
-                'end_marker': self.legacy_end,
-                'password_hash': None  # Will be determined during extraction
-            }
-            layers.append(layer_info)
-        
-        # Check for versioned layers
-        for version in range(1, 6):
-            magic_header = self.magic_headers.get(version)
-            if magic_header:
-                pos = file_data.find(magic_header)
-                if pos != -1:
-                    layer_info = {
-                        'layer_number': version,
-                        'magic_pos': pos,
-                        'magic_header': magic_header,
-                        'end_marker': self.end_markers[version],
-                        'password_hash': None
-                    }
-                    layers.append(layer_info)
+        if marker_positions is None:
+            marker_positions = self._scan_markers(file_data)
+        
+        # The first occurrence of each magic wins
+        for magic_header, (layer_number, end_marker) in self._layer_magics.items():
+            pos = marker_positions.get(magic_header)
+            if pos is not None:
+                layers.append({
+                    'layer_number': layer_number,  # 0 = legacy layer
+                    'magic_pos': pos,
+                    'magic_header': magic_header,
+                    'end_marker': end_marker,
+                    'password_hash': None  # Will be determined during extraction
+                })
         
         # Sort layers by position in file
         layers.sort(key=lambda x: x['magic_pos'])
@@ -236,7 +343,8 @@ class MultiLayerSteganography:
     def _embed_new_layer(self, file_data: bytes, secret_data: bytes, 
                         output_path: str, password: Optional[str], 
                         filename: str, file_ext: str, layer_number: int,
-                        existing_layers: List[Dict]) -> Dict[str, Any]:
+                        existing_layers: List[Dict], carrier_hash: Optional[str] = None,
+                        index_pos: Optional[int] = None) -> Dict[str, Any]:
         """Embed a new layer into the file"""
         
         if layer_number > 5:
@@ -247,7 +355,7 @@ class MultiLayerSteganography:
         password_hash = hashlib.sha256((password or "").encode()).hexdigest() if password else None
         
         # SECURITY: Add file hash to bind this layer to THIS specific file
-        file_hash = hashlib.sha256(file_data).hexdigest()[:16]
+        file_hash = carrier_hash or hashlib.sha256(file_data).hexdigest()[:16]
         
         metadata = {
             'layer_id': layer_id,
@@ -255,16 +363,17 @@ class MultiLayerSteganography:
             'filename': filename,
             'original_size': len(secret_data),
             'encrypted': bool(password),
+            'kdf_iterations': self.kdf_iterations if password else None,
             'password_hash': password_hash,
             'checksum': hashlib.sha256(secret_data).hexdigest(),
             'carrier_ext': file_ext,
             'file_hash': file_hash,  # SECURITY: Bind to specific file
-            'timestamp': hashlib.md5(str(layer_number).encode()).hexdigest()[:8]  # Layer identifier
+            'timestamp': hashlib.blake2b(str(layer_number).encode(), digest_size=4).hexdigest()  # Layer identifier
         }
         
         # Encrypt if password provided
         if password:
-            payload_data = self._encrypt_data(secret_data, password)
+            payload_data = self._encrypt_data(secret_data, password, self.kdf_iterations)
         else:
             payload_data = secret_data
         
@@ -274,27 +383,24 @@ class MultiLayerSteganography:
         magic_header = self.magic_headers[layer_number]
         end_marker = self.end_markers[layer_number]
         
-        # Build new layer format
-        new_layer = (
-            magic_header +
-            len(metadata_json).to_bytes(4, 'little') +
-            metadata_json +
-            len(payload_data).to_bytes(4, 'little') +
-            payload_data +
+        # Build new layer format as separate chunks so the payload is never copied again
+        new_layer_chunks = [
+            magic_header,
+            _U32.pack(len(metadata_json)),
+            metadata_json,
+            _U32.pack(len(payload_data)),
+            payload_data,
             end_marker
-        )
+        ]
         
-        # Append new layer to existing file data
-        final_file = file_data + new_layer
+        # Carrier (minus old index) + new layer + updated layer index
+        chunks = self._update_layer_index(file_data, new_layer_chunks, existing_layers, metadata, index_pos)
         
-        # Update layer index
-        final_file = self._update_layer_index(final_file, existing_layers, metadata)
-        
-        # Write final file
+        # Write final file chunk by chunk instead of concatenating a full copy first
         with open(output_path, 'wb') as f:
-            f.write(final_file)
+            f.writelines(chunks)
         
-        overhead = len(final_file) - len(file_data)
+        overhead = sum(len(chunk) for chunk in chunks) - len(file_data)
         
         print(f"[MULTI-LAYER] ✅ Layer #{layer_number} added successfully")
         print(f"[MULTI-LAYER] ✅ Added {overhead} bytes for new layer")
@@ -310,20 +416,29 @@ class MultiLayerSteganography:
             'file_type_preserved': True
         }
     
-    def _update_layer_index(self, file_data: bytes, existing_layers: List[Dict], new_layer_metadata: Dict) -> bytes:
-        """Update or create the layer index at the end of file"""
+    def _update_layer_index(self, file_data: bytes, new_layer_chunks: List[bytes], existing_layers: List[Dict],
+                            new_layer_metadata: Dict, index_pos: Optional[int] = None) -> List[Union[bytes, memoryview]]:
+        """Update or create the layer index at the end of file.
+        
+        Returns the output as a list of chunks (zero-copy views of the carrier, the new
+        layer's chunks and the index block) to be written in order.
+        """
         
         # Remove existing index if present (but preserve all layer data)
-        index_pos = file_data.find(self.layer_index_magic)
+        carrier = memoryview(file_data)
+        chunks = [carrier]
+        if index_pos is None:
+            index_pos = file_data.find(self.layer_index_magic)
         if index_pos != -1:
             # Find the end of the index block
             index_end_pos = file_data.find(self.layer_index_end, index_pos)
             if index_end_pos != -1:
                 # Remove only the index block, keep everything else
-                file_data = file_data[:index_pos] + file_data[index_end_pos + len(self.layer_index_end):]
+                chunks = [carrier[:index_pos], carrier[index_end_pos + len(self.layer_index_end):]]
             else:
                 # Fallback: truncate at index start if end marker not found
-                file_data = file_data[:index_pos]
+                chunks = [carrier[:index_pos]]
+        chunks.extend(new_layer_chunks)
         
         # Build complete layer list
         all_layers = []
@@ -354,19 +469,19 @@ class MultiLayerSteganography:
         # Append index
         index_block = (
             self.layer_index_magic +
-            len(index_json).to_bytes(4, 'little') +
+            _U32.pack(len(index_json)) +
             index_json +
             self.layer_index_end
         )
         
-        return file_data + index_block
+        chunks.append(index_block)
+        return chunks
     
     def extract_all_layers(self, stego_file_path: str, password: Optional[str] = None, 
                           output_dir: str = None) -> Dict[str, Any]:
         """Extract only the most recent layer that matches the password - prevents cross-contamination"""
         
-        with open(stego_file_path, 'rb') as f:
-            file_data = f.read()
+        file_data = self._map_carrier(stego_file_path)
         
         print(f"[MULTI-LAYER] Analyzing file for hidden layers...")
         
@@ -383,16 +498,27 @@ class MultiLayerSteganography:
         # This allows proper multi-layer functionality
         extracted_layers = []
         
-        # Process layers in order (oldest to newest for proper numbering)
-        for layer_info in existing_layers:
+        # Hash the password once for every layer's compatibility check
+        provided_hash = hashlib.sha256(password.encode()).hexdigest() if password else None
+        
+        def extract_layer(layer_info):
             try:
-                layer_data = self._extract_single_layer(file_data, layer_info, password)
-                if layer_data:
-                    extracted_layers.append(layer_data)
-                    print(f"[MULTI-LAYER] ✅ Extracted layer #{layer_info['layer_number']}")
-                    # Continue to extract ALL matching layers, not just the first one
+                return self._extract_single_layer(file_data, layer_info, password, provided_hash)
             except Exception as e:
                 print(f"[MULTI-LAYER] ⚠️ Failed to extract layer #{layer_info['layer_number']}: {e}")
+                return None
+        
+        # Each layer has its own salt, so the PBKDF2 + AES-GCM work is independent
+        # and overlaps across threads (the KDF releases the GIL)
+        with ThreadPoolExecutor(max_workers=min(5, len(existing_layers))) as executor:
+            results = list(executor.map(extract_layer, existing_layers))
+        
+        # Collect in order (oldest to newest for proper numbering)
+        for layer_info, layer_data in zip(existing_layers, results):
+            if layer_data:
+                extracted_layers.append(layer_data)
+                print(f"[MULTI-LAYER] ✅ Extracted layer #{layer_info['layer_number']}")
+                # Continue to extract ALL matching layers, not just the first one
         
         if not extracted_layers:
             return {'success': False, 'message': 'No layers could be extracted with the provided password'}
@@ -438,7 +564,8 @@ class MultiLayerSteganography:
         # Multiple layers - create zip file
         return self._create_multi_layer_response(extracted_layers, output_dir, len(existing_layers))
     
-    def _extract_single_layer(self, file_data: bytes, layer_info: Dict, password: Optional[str]) -> Optional[Dict[str, Any]]:
+    def _extract_single_layer(self, file_data: bytes, layer_info: Dict, password: Optional[str],
+                              provided_hash: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Extract a single layer from file data"""
         
         magic_header = layer_info['magic_header']
@@ -452,15 +579,24 @@ class MultiLayerSteganography:
             
             # Parse metadata
             metadata_size_pos = magic_pos + len(magic_header)
-            metadata_size = int.from_bytes(file_data[metadata_size_pos:metadata_size_pos+4], 'little')
+            metadata_size = _U32.unpack_from(file_data, metadata_size_pos)[0]
             
             metadata_pos = metadata_size_pos + 4
             metadata_json = file_data[metadata_pos:metadata_pos+metadata_size]
+            
+            # Cheap pre-check on the raw metadata so wrong-password layers skip the JSON parse
+            if password:
+                if provided_hash is None:
+                    provided_hash = hashlib.sha256(password.encode()).hexdigest()
+                if b'"password_hash": "' in metadata_json and provided_hash.encode() not in metadata_json:
+                    return None  # Password doesn't match this layer
+            elif b'"encrypted": true' in metadata_json:
+                return None  # Layer is encrypted but no password provided
+            
             metadata = json.loads(metadata_json.decode('utf-8'))
             
             # Check password compatibility
             if password:
-                provided_hash = hashlib.sha256(password.encode()).hexdigest()
                 if metadata.get('password_hash') and metadata['password_hash'] != provided_hash:
                     return None  # Password doesn't match this layer
             elif metadata.get('encrypted', False):
@@ -468,16 +604,17 @@ class MultiLayerSteganography:
             
             # Parse data
             data_size_pos = metadata_pos + metadata_size
-            data_size = int.from_bytes(file_data[data_size_pos:data_size_pos+4], 'little')
+            data_size = _U32.unpack_from(file_data, data_size_pos)[0]
             
             payload_pos = data_size_pos + 4
-            payload_data = file_data[payload_pos:payload_pos+data_size]
+            # Zero-copy view: AES-GCM decrypts straight from file_data
+            payload_data = memoryview(file_data)[payload_pos:payload_pos+data_size]
             
             # Decrypt if needed
             if metadata['encrypted'] and password:
-                secret_data = self._decrypt_data(payload_data, password)
+                secret_data = self._decrypt_data(payload_data, password, self._layer_kdf_iterations(metadata))
             else:
-                secret_data = payload_data
+                secret_data = bytes(payload_data)
             
             return {
                 'layer_number': metadata.get('layer_number', 0),
@@ -497,7 +634,7 @@ class MultiLayerSteganography:
         try:
             # Parse metadata (legacy format)
             metadata_size_pos = magic_pos + len(self.legacy_magic)
-            metadata_size = int.from_bytes(file_data[metadata_size_pos:metadata_size_pos+4], 'little')
+            metadata_size = _U32.unpack_from(file_data, metadata_size_pos)[0]
             
             metadata_pos = metadata_size_pos + 4
             metadata_json = file_data[metadata_pos:metadata_pos+metadata_size]
@@ -511,16 +648,17 @@ class MultiLayerSteganography:
             
             # Parse data
             data_size_pos = metadata_pos + metadata_size
-            data_size = int.from_bytes(file_data[data_size_pos:data_size_pos+4], 'little')
+            data_size = _U32.unpack_from(file_data, data_size_pos)[0]
             
             payload_pos = data_size_pos + 4
-            payload_data = file_data[payload_pos:payload_pos+data_size]
+            # Zero-copy view: AES-GCM decrypts straight from file_data
+            payload_data = memoryview(file_data)[payload_pos:payload_pos+data_size]
             
             # Decrypt if needed
             if metadata['encrypted'] and password:
-                secret_data = self._decrypt_data(payload_data, password)
+                secret_data = self._decrypt_data(payload_data, password, self._layer_kdf_iterations(metadata))
             else:
-                secret_data = payload_data
+                secret_data = bytes(payload_data)
             
             return {
                 'layer_number': 0,  # Legacy
@@ -541,7 +679,7 @@ class MultiLayerSteganography:
             output_dir = tempfile.mkdtemp()
         
         # Create zip file with all extracted layers
-        zip_filename = f"multilayer_extraction_{hashlib.md5(str(len(extracted_layers)).encode()).hexdigest()[:8]}.zip"
+        zip_filename = f"multilayer_extraction_{hashlib.blake2b(str(len(extracted_layers)).encode(), digest_size=4).hexdigest()}.zip"
         zip_path = os.path.join(output_dir, zip_filename)
         
         layer_info = []
@@ -549,15 +687,13 @@ class MultiLayerSteganography:
         
         with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
             for i, layer in enumerate(extracted_layers):
-                # Save individual layer file
                 layer_filename = f"layer_{layer['layer_number']}_{layer['filename']}"
-                layer_path = os.path.join(output_dir, layer_filename)
-                
-                with open(layer_path, 'wb') as f:
-                    f.write(layer['content'])
                 
-                # Add to zip
-                zipf.write(layer_path, layer_filename)
+                # Add to zip straight from memory (store already-compressed media/archives
+                # instead of re-deflating them)
+                detected_ext = os.path.splitext(detect_filename_from_content(layer['content']))[1]
+                compress_type = zipfile.ZIP_STORED if detected_ext in _INCOMPRESSIBLE_EXTS else zipfile.ZIP_DEFLATED
+                zipf.writestr(layer_filename, layer['content'], compress_type=compress_type)
                 
                 # Collect info for response
                 try:
@@ -575,9 +711,6 @@ class MultiLayerSteganography:
                     'size': len(layer['content']),
                     'saved_as': layer_filename
                 })
-                
-                # Clean up individual file
-                os.remove(layer_path)
         
         return {
             'success': True,
@@ -590,39 +723,40 @@ class MultiLayerSteganography:
             'layer_details': layer_info
         }
     
-    def _encrypt_data(self, data: bytes, password: str) -> bytes:
+    def _layer_kdf_iterations(self, metadata: Dict[str, Any]) -> int:
+        """PBKDF2 iteration count recorded in layer metadata; older layers without one use the default"""
+        if 'kdf_iterations' not in metadata:
+            return DEFAULT_KDF_ITERATIONS
+        return _validate_kdf_iterations(metadata['kdf_iterations'])
+    
+    def _encrypt_data(self, data: bytes, password: str, iterations: Optional[int] = None) -> bytearray:
         """Encrypt data using AES-GCM"""
         salt = os.urandom(16)
         nonce = os.urandom(12)
         
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-            backend=default_backend()
-        )
-        key = kdf.derive(password.encode())
+        if iterations is None:
+            iterations = self.kdf_iterations
+        key = _derive_key(password.encode(), salt, _validate_kdf_iterations(iterations))
         
-        aesgcm = AESGCM(key)
-        ciphertext = aesgcm.encrypt(nonce, data, None)
+        # Encrypt straight into the preallocated salt + nonce + ciphertext + tag buffer
+        out = bytearray(len(salt) + len(nonce) + len(data) + 16)
+        out[:16] = salt
+        out[16:28] = nonce
+        encryptor = Cipher(algorithms.AES(key), modes.GCM(nonce)).encryptor()
+        written = encryptor.update_into(data, memoryview(out)[28:])
+        encryptor.finalize()
+        out[28 + written:] = encryptor.tag
         
-        return salt + nonce + ciphertext
+        return out
     
-    def _decrypt_data(self, encrypted_data: bytes, password: str) -> bytes:
+    def _decrypt_data(self, encrypted_data: Union[bytes, memoryview], password: str,
+                      iterations: int = DEFAULT_KDF_ITERATIONS) -> bytes:
         """Decrypt data using AES-GCM"""
-        salt = encrypted_data[:16]
+        salt = bytes(encrypted_data[:16])  # KDF backends expect bytes, not a view of the carrier
         nonce = encrypted_data[16:28]
         ciphertext = encrypted_data[28:]
         
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-            backend=default_backend()
-        )
-        key = kdf.derive(password.encode())
+        key = _derive_key(password.encode(), salt, _validate_kdf_iterations(iterations))
         
         aesgcm = AESGCM(key)
         return aesgcm.decrypt(nonce, ciphertext, None)
@@ -631,8 +765,8 @@ class MultiLayerSteganography:
 class UniversalFileSteganography(MultiLayerSteganography):
     """Backward compatible wrapper that adds multi-layer support to existing API"""
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, kdf_iterations: int = DEFAULT_KDF_ITERATIONS):
+        super().__init__(kdf_iterations)
     
     def extract_data(self, stego_file_path: str, password: Optional[str] = None, 
                      output_dir: str = None) -> Optional[Union[Tuple[bytes, str], Dict[str, Any]]]:
@@ -755,13 +889,13 @@ class UniversalFileSteganography(MultiLayerSteganography):
                         continue
                     
                     # Read metadata length
-                    metadata_len = struct.unpack('<I', data_block[:4])[0]
+                    metadata_len = _U32.unpack_from(data_block, 0)[0]
                     if metadata_len > len(data_block) - 8:
                         start_pos = end_idx + len(magic_end)
                         continue
                     
                     # Read content length
-                    content_len = struct.unpack('<I', data_block[4:8])[0]
+                    content_len = _U32.unpack_from(data_block, 4)[0]
                     if metadata_len + content_len + 8 > len(data_block):
                         start_pos = end_idx + len(magic_end)
                         continue
@@ -783,7 +917,7 @@ class UniversalFileSteganography(MultiLayerSteganography):
                     # Decrypt if password provided
                     if password and metadata.get('encrypted', False):
                         try:
-                            content_bytes = self._decrypt_data(content_bytes, password)
+                            content_bytes = self._decrypt_data(content_bytes, password, self._layer_kdf_iterations(metadata))
                         except Exception as decrypt_error:
                             print(f"[SECURE EXTRACT] Decryption failed: {decrypt_error}")
                             start_pos = end_idx + len(magic_end)
@@ -166,7 +166,7 @@ class OptimizedVideoSteganographyManager:
         
         # Embed data into frames efficiently  
         data_to_embed = magic + data_package
-        data_bits = ''.join(format(byte, '08b') for byte in data_to_embed)
+        data_bits = np.unpackbits(np.frombuffer(data_to_embed, dtype=np.uint8))
         
         bit_index = 0
         frame_count = 0
@@ -178,21 +178,19 @@ class OptimizedVideoSteganographyManager:
             
             # Embed bits into LSB of each color channel
             if bit_index < len(data_bits):
-                flat_frame = frame.flatten()
+                flat_frame = frame.reshape(-1)  # View - LSB writes land in `frame`
                 
                 for i in range(0, len(flat_frame), redundancy):
                     if bit_index >= len(data_bits):
                         break
                     
                     # Embed same bit multiple times for redundancy
-                    bit = int(data_bits[bit_index])
+                    bit = data_bits[bit_index]
                     for j in range(redundancy):
                         if i + j < len(flat_frame):
                             flat_frame[i + j] = (flat_frame[i + j] & 0xFE) | bit
                     
                     bit_index += 1
-                
-                frame = flat_frame.reshape(frame.shape)
             
             # Save frame as PNG for lossless storage
             frame_filename = f"frame_{frame_count:06d}.png"
@@ -274,7 +272,7 @@ class OptimizedVideoSteganographyManager:
             frame = cv2.imread(frame_path)
             
             if frame is not None:
-                flat_frame = frame.flatten()
+                flat_frame = frame.reshape(-1)
                 
                 # Extract LSBs with redundancy
                 for i in range(0, len(flat_frame), redundancy):
@@ -282,17 +280,11 @@ class OptimizedVideoSteganographyManager:
                         # Take majority vote from redundant bits
                         bits = [flat_frame[i + j] & 1 for j in range(redundancy)]
                         majority_bit = 1 if sum(bits) > redundancy // 2 else 0
-                        all_bits.append(str(majority_bit))
-        
-        # Convert bits to bytes
-        bit_string = ''.join(all_bits)
-        extracted_bytes = bytearray()
+                        all_bits.append(majority_bit)
         
-        for i in range(0, len(bit_string), 8):
-            if i + 8 <= len(bit_string):
-                byte_bits = bit_string[i:i+8]
-                byte_value = int(byte_bits, 2)
-                extracted_bytes.append(byte_value)
+        # Convert bits to bytes (trailing partial byte dropped)
+        bit_array = np.array(all_bits[:len(all_bits) // 8 * 8], dtype=np.uint8)
+        extracted_bytes = bytearray(np.packbits(bit_array).tobytes())
         
         # Verify magic header
         magic = b'VEILFORGE_VIDEO_V1'
@@ -13,18 +13,152 @@ import os
 import cv2
 import json
 import hashlib
+import mmap
 import time
 import tempfile
 import struct
 import base64
-from typing import Dict, Any, Optional, Union, Tuple, List
+import queue
+import threading
+from fractions import Fraction
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterable, Iterator, Optional, Union, Tuple, List
 import numpy as np
 
+# Optional dependency for JIT-compiled LSB embed / majority-vote kernels
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Optional dependency for a single decode -> embed -> encode loop without OpenCV in between
+try:
+    import av
+    HAS_AV = True
+except ImportError:
+    HAS_AV = False
+
+# Bytes hashed from each of the start, middle and end of a video file for its fingerprint
+HASH_SAMPLE_BYTES = 1 << 20
+
+# Data-carrying frames are stored back to back in one raw file (LSB-modified pixels don't
+# compress); per-frame '.npy' / '.png' files are still read for older frame directories
+FRAME_BLOB_NAME = 'frames.raw'
+FRAME_FILE_EXTS = ('.npy', '.png')
+
+if HAS_NUMBA:
+    @numba.njit(parallel=True, cache=True, boundscheck=False)
+    def _embed_bits_kernel(flat, bits, redundancy):
+        # Writes each bit into `redundancy` consecutive LSBs without materializing a repeated tile
+        for i in numba.prange(bits.shape[0]):
+            base = i * redundancy
+            for j in range(redundancy):
+                flat[base + j] = (flat[base + j] & 0xFE) | bits[i]
+    
+    @numba.njit(parallel=True, cache=True, boundscheck=False)
+    def _majority_bits_kernel(flat, redundancy, out):
+        for i in numba.prange(out.shape[0]):
+            base = i * redundancy
+            votes = 0
+            for j in range(redundancy):
+                votes += flat[base + j] & 1
+            out[i] = 1 if votes * 2 > redundancy else 0
+
+def _read_frame_file(frame_path: str) -> Optional[np.ndarray]:
+    """Load stored frame data: the raw frame blob (flat), a .npy frame or a legacy PNG.
+    
+    Raw and .npy files are memory-mapped read-only: no decode and no copy, pages come
+    straight from the OS page cache as the data is scanned.
+    """
+    if frame_path.endswith('.raw'):
+        return np.asarray(np.memmap(frame_path, dtype=np.uint8, mode='r'))
+    if frame_path.endswith('.npy'):
+        return np.asarray(np.load(frame_path, mmap_mode='r'))
+    return cv2.imread(frame_path)
+
+def _embed_bits(flat: np.ndarray, bits: np.ndarray, redundancy: int) -> None:
+    """Embed bits in place into the LSBs of a flat uint8 buffer, `redundancy` copies per bit"""
+    if HAS_NUMBA:
+        _embed_bits_kernel(flat, bits, redundancy)
+        return
+    
+    # OpenCV's SIMD bitwise ops, in place (dst=) so no masked temporary is allocated
+    bit_tiles = np.repeat(bits, redundancy)
+    target = flat[:bit_tiles.size]
+    cv2.bitwise_and(target, 0xFE, dst=target)
+    cv2.bitwise_or(target, bit_tiles, dst=target)
+
+def _majority_bits(flat: np.ndarray, redundancy: int, out: np.ndarray) -> None:
+    """Majority-vote `out.size` bits from consecutive groups of `redundancy` LSBs into `out`.
+    
+    A bit is 1 when more than half of its copies are 1 (ties on even redundancy give 0).
+    """
+    if HAS_NUMBA:
+        _majority_bits_kernel(flat, redundancy, out)
+        return
+    
+    votes = (flat[:out.size * redundancy].reshape(-1, redundancy) & 1).sum(axis=1, dtype=np.uint16)
+    out[:] = votes * 2 > redundancy
+
+class _FrameReader:
+    """Decode a VideoCapture on a background thread so decoding overlaps frame processing.
+    
+    Iterating yields (frame_index, frame) tuples; at most `maxsize` decoded frames are
+    buffered. close() stops the thread and must be called before the capture is released.
+    """
+    
+    _EOF = object()
+    
+    def __init__(self, cap: cv2.VideoCapture, maxsize: int = 8):
+        self._cap = cap
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def _put(self, item) -> None:
+        # Wake up periodically so close() is not stuck behind a full queue
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+    
+    def _run(self) -> None:
+        frame_index = 0
+        try:
+            while not self._stopped.is_set():
+                ret, frame = self._cap.read()
+                if not ret:
+                    break
+                self._put((frame_index, frame))
+                frame_index += 1
+        except Exception as e:
+            self._put(e)
+        finally:
+            self._put(self._EOF)
+    
+    def __iter__(self) -> Iterator[Tuple[int, np.ndarray]]:
+        while True:
+            item = self._queue.get()
+            if item is self._EOF:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    
+    def close(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
 class OptimizedVideoSteganographyManager:
     """Optimized Video Steganography with proper MP4 support and unique identification"""
     
-    def __init__(self, password: str = ""):
+    def __init__(self, password: str = "", redundancy: int = 3):
         self.password = password
+        self.redundancy = redundancy  # Copies of each bit; recorded in frame_info.json for extraction
         self.outputs_dir = os.path.join(os.path.dirname(__file__), '..', 'outputs')
         os.makedirs(self.outputs_dir, exist_ok=True)
     
@@ -32,23 +166,17 @@ class OptimizedVideoSteganographyManager:
         """Generate unique hash for video file based on content"""
         hasher = hashlib.sha256()
         
-        # Hash first few frames and file stats for uniqueness
-        cap = cv2.VideoCapture(video_path)
-        frame_count = 0
-        
-        while frame_count < 5:  # Sample first 5 frames
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            # Hash frame data
-            hasher.update(frame.tobytes())
-            frame_count += 1
-        
-        cap.release()
+        # Hash raw file samples (start, middle, end) - fingerprinting needs no decoding
+        with open(video_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    middle = len(mm) // 2
+                    hasher.update(mm[:HASH_SAMPLE_BYTES])
+                    hasher.update(mm[middle:middle + HASH_SAMPLE_BYTES])
+                    hasher.update(mm[-HASH_SAMPLE_BYTES:])
         
         # Add file size and modification time for extra uniqueness
-        stat = os.stat(video_path)
         hasher.update(str(stat.st_size).encode())
         hasher.update(str(stat.st_mtime).encode())
         
@@ -60,8 +188,8 @@ class OptimizedVideoSteganographyManager:
         frame_dir_name = f"{base_name}_{video_hash}_frames"
         return os.path.join(self.outputs_dir, frame_dir_name)
     
-    def _create_optimized_video(self, frame_dir: str, output_path: str, fps: float, width: int, height: int):
-        """Create properly encoded H.264 MP4 video"""
+    def _create_optimized_video(self, frames: Iterable[np.ndarray], output_path: str, fps: float, width: int, height: int):
+        """Create properly encoded H.264 MP4 video from in-memory frames"""
         
         # Use H.264 codec for maximum compatibility
         fourcc = cv2.VideoWriter_fourcc(*'mp4v')  # Standard MP4 codec
@@ -77,19 +205,86 @@ class OptimizedVideoSteganographyManager:
         if not out.isOpened():
             raise Exception("Failed to create video writer with compatible codec")
         
-        # Write frames efficiently
-        frame_files = sorted([f for f in os.listdir(frame_dir) if f.endswith('.png')])
+        # Write frames straight from memory - no PNG encode/decode round-trip
+        print(f"[VideoStego] Encoding frames with H.264 codec...")
         
-        print(f"[VideoStego] Encoding {len(frame_files)} frames with H.264 codec...")
-        
-        for frame_file in frame_files:
-            frame_path = os.path.join(frame_dir, frame_file)
-            frame = cv2.imread(frame_path)
-            if frame is not None:
+        frame_count = 0
+        try:
+            for frame in frames:
                 out.write(frame)
+                frame_count += 1
+        finally:
+            out.release()
         
-        out.release()
-        print(f"[VideoStego] ✅ Created compatible MP4: {output_path}")
+        print(f"[VideoStego] ✅ Created compatible MP4 ({frame_count} frames): {output_path}")
+    
+    def _embed_frames(self, decoded_frames: Iterable[Tuple[int, np.ndarray]], data_bits: np.ndarray,
+                      redundancy: int, frame_dir: str) -> Iterator[np.ndarray]:
+        """Yield every decoded carrier frame with the data bits written into its LSBs.
+        
+        The bytes carrying bits are appended to the frame blob in `frame_dir` (that is all
+        extraction reads); frames past the data go to the encoder untouched.
+        """
+        bit_index = 0
+        blob_writes = []
+        
+        # One writer thread appends in order, so the file I/O (GIL released) overlaps
+        # decode/encode; leaving the with-block waits for every pending write
+        with open(os.path.join(frame_dir, FRAME_BLOB_NAME), 'wb') as blob, \
+                ThreadPoolExecutor(max_workers=1) as blob_writer:
+            for _, frame in decoded_frames:
+                # Embed bits into LSB of each color channel
+                if bit_index < len(data_bits):
+                    flat_frame = frame.reshape(-1)  # View - LSB writes land in `frame`
+                    
+                    # Embed same bit multiple times for redundancy, one pass per frame
+                    carrier_bytes = len(flat_frame) // redundancy * redundancy
+                    n_bits = min(carrier_bytes // redundancy, len(data_bits) - bit_index)
+                    _embed_bits(flat_frame, data_bits[bit_index:bit_index + n_bits], redundancy)
+                    
+                    bit_index += n_bits
+                    
+                    # Store the carrier bytes losslessly (copy - the decoder may reuse its buffer);
+                    # the blob then holds one unbroken run of bit groups
+                    blob_writes.append(blob_writer.submit(blob.write, flat_frame[:carrier_bytes].copy()))
+                
+                yield frame
+        
+        # Re-raise any failed write here rather than losing it in its future
+        for write in blob_writes:
+            write.result()
+    
+    def _embed_video_pyav(self, carrier_video_path: str, output_path: str, fps: float, width: int, height: int,
+                          data_bits: np.ndarray, redundancy: int, frame_dir: str):
+        """Decode, embed and H.264-encode in one PyAV loop (no VideoCapture/VideoWriter hand-off)"""
+        
+        with av.open(carrier_video_path) as source, av.open(output_path, 'w') as target:
+            in_stream = source.streams.video[0]
+            in_stream.thread_type = 'AUTO'
+            
+            out_stream = target.add_stream('libx264', rate=Fraction(fps).limit_denominator(1001))
+            out_stream.width = width
+            out_stream.height = height
+            out_stream.pix_fmt = 'yuv420p'
+            out_stream.options = {'crf': '18'}
+            
+            print(f"[VideoStego] Encoding frames with H.264 codec (PyAV)...")
+            
+            decoded_frames = ((frame_index, frame.to_ndarray(format='bgr24'))
+                              for frame_index, frame in enumerate(source.decode(in_stream)))
+            embedded_frames = self._embed_frames(decoded_frames, data_bits, redundancy, frame_dir)
+            
+            frame_count = 0
+            try:
+                for frame in embedded_frames:
+                    target.mux(out_stream.encode(av.VideoFrame.from_ndarray(frame, format='bgr24')))
+                    frame_count += 1
+            finally:
+                embedded_frames.close()
+            
+            target.mux(out_stream.encode())  # flush delayed frames
+        
+        print(f"[VideoStego] ✅ Created compatible MP4 ({frame_count} frames): {output_path}")
     
     def embed_data(self, carrier_video_path: str, secret_data: Union[str, bytes], 
                    output_filename: str = None, secret_filename: str = None) -> Dict[str, Any]:
@@ -141,12 +336,11 @@ class OptimizedVideoSteganographyManager:
             'total_frames': total_frames,
             'fps': fps,
             'video_hash': video_hash,
+            'format': 'raw',
+            'redundancy': self.redundancy,
             'created_at': time.time()
         }
         
-        with open(os.path.join(frame_dir, "frame_info.json"), 'w') as f:
-            json.dump(frame_info, f, indent=2)
-        
         # Prepare data for embedding with reduced redundancy for speed
         magic = b'VEILFORGE_VIDEO_V1'
         metadata_json = json.dumps(metadata).encode('utf-8')
@@ -157,7 +351,7 @@ class OptimizedVideoSteganographyManager:
         
         # Calculate capacity with optimized redundancy
         pixels_per_frame = width * height * 3  # RGB
-        redundancy = 3  # Reduced from 5 to 3 for better performance
+        redundancy = self.redundancy
         total_capacity = (total_frames * pixels_per_frame) // redundancy
         
         required_bits = len(magic + data_package) * 8
@@ -170,41 +364,7 @@ class OptimizedVideoSteganographyManager:
         
         # Embed data into frames efficiently  
         data_to_embed = magic + data_package
-        data_bits = ''.join(format(byte, '08b') for byte in data_to_embed)
-        
-        bit_index = 0
-        frame_count = 0
-        
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            # Embed bits into LSB of each color channel
-            if bit_index < len(data_bits):
-                flat_frame = frame.flatten()
-                
-                for i in range(0, len(flat_frame), redundancy):
-                    if bit_index >= len(data_bits):
-                        break
-                    
-                    # Embed same bit multiple times for redundancy
-                    bit = int(data_bits[bit_index])
-                    for j in range(redundancy):
-                        if i + j < len(flat_frame):
-                            flat_frame[i + j] = (flat_frame[i + j] & 0xFE) | bit
-                    
-                    bit_index += 1
-                
-                frame = flat_frame.reshape(frame.shape)
-            
-            # Save frame as PNG for lossless storage
-            frame_filename = f"frame_{frame_count:06d}.png"
-            frame_path = os.path.join(frame_dir, frame_filename)
-            cv2.imwrite(frame_path, frame)
-            frame_count += 1
-        
-        cap.release()
+        data_bits = np.unpackbits(np.frombuffer(data_to_embed, dtype=np.uint8))
         
         # Generate output filename
         if not output_filename:
@@ -213,8 +373,25 @@ class OptimizedVideoSteganographyManager:
         
         output_path = os.path.join(self.outputs_dir, output_filename)
         
-        # Create properly encoded MP4 video
-        self._create_optimized_video(frame_dir, output_path, fps, width, height)
+        # Create properly encoded MP4 video, embedding each frame as the encoder consumes it
+        if HAS_AV:
+            cap.release()
+            self._embed_video_pyav(carrier_video_path, output_path, fps, width, height,
+                                   data_bits, redundancy, frame_dir)
+        else:
+            frame_reader = _FrameReader(cap)
+            embedded_frames = self._embed_frames(frame_reader, data_bits, redundancy, frame_dir)
+            try:
+                self._create_optimized_video(embedded_frames, output_path, fps, width, height)
+            finally:
+                embedded_frames.close()
+                frame_reader.close()  # Stops the decode thread before the capture goes away
+                cap.release()
+        
+        # Record the stored frame data so extraction doesn't have to list and sort the directory
+        frame_info['frames'] = [FRAME_BLOB_NAME]
+        with open(os.path.join(frame_dir, "frame_info.json"), 'w') as f:
+            json.dump(frame_info, f, indent=2)
         
         processing_time = time.time() - start_time
         
@@ -267,45 +444,70 @@ class OptimizedVideoSteganographyManager:
         
         print(f"[VideoStego] ✅ Found matching frame directory: {frame_dir}")
         
-        # Load frames and extract data
-        frame_files = sorted([f for f in os.listdir(frame_dir) if f.endswith('.png')])
+        # Load frames and extract data - listed in frame_info.json by newer embeds
+        frame_files = frame_info.get('frames')
+        if frame_files is None:
+            frame_files = sorted([f for f in os.listdir(frame_dir) if f.endswith(FRAME_FILE_EXTS)])
         
         if not frame_files:
             return None
         
-        print(f"[VideoStego] Extracting from {len(frame_files)} PNG frames...")
+        print(f"[VideoStego] Extracting from {len(frame_files)} frames...")
         
-        # Extract bits from frames
-        all_bits = []
-        redundancy = 3  # Match embedding redundancy
+        # Extract bits from frames into one buffer sized for every stored frame
+        redundancy = frame_info.get('redundancy', 3)  # Match embedding redundancy (3 before it was recorded)
+        if frame_files == [FRAME_BLOB_NAME]:
+            # All carrier bytes in one mapped file - voted in a single pass below
+            capacity_bits = os.path.getsize(os.path.join(frame_dir, FRAME_BLOB_NAME)) // redundancy
+        else:
+            bits_per_frame = (frame_info.get('width', 0) * frame_info.get('height', 0) * 3) // redundancy
+            capacity_bits = bits_per_frame * len(frame_files)
+        bits = np.empty(capacity_bits, dtype=np.uint8)
+        n_bits = 0
+        
+        magic = b'VEILFORGE_VIDEO_V1'
+        header_bits = (len(magic) + 4) * 8  # Magic + metadata size
+        metadata_end = None  # End of the metadata, known once the header has been read
+        needed_bits = None  # Total length, known once the metadata has been read
         
         for frame_file in frame_files:
             frame_path = os.path.join(frame_dir, frame_file)
-            frame = cv2.imread(frame_path)
+            frame = _read_frame_file(frame_path)
             
             if frame is not None:
-                flat_frame = frame.flatten()
+                flat_frame = frame.reshape(-1)  # View - read-only, no per-frame copy
                 
-                # Extract LSBs with redundancy
-                for i in range(0, len(flat_frame), redundancy):
-                    if i + redundancy <= len(flat_frame):
-                        # Take majority vote from redundant bits
-                        bits = [flat_frame[i + j] & 1 for j in range(redundancy)]
-                        majority_bit = 1 if sum(bits) > redundancy // 2 else 0
-                        all_bits.append(str(majority_bit))
-        
-        # Convert bits to bytes
-        bit_string = ''.join(all_bits)
-        extracted_bytes = bytearray()
-        
-        for i in range(0, len(bit_string), 8):
-            if i + 8 <= len(bit_string):
-                byte_bits = bit_string[i:i+8]
-                byte_value = int(byte_bits, 2)
-                extracted_bytes.append(byte_value)
+                # Extract LSBs with redundancy - majority vote over each group of redundant bits,
+                # and once the payload length is known only over the bits still needed, so the
+                # tail of the last mapped frame is never paged in
+                bit_limit = needed_bits if needed_bits is not None else bits.size
+                frame_bits = min(flat_frame.size // redundancy, bit_limit - n_bits)
+                _majority_bits(flat_frame, redundancy, bits[n_bits:n_bits + frame_bits])
+                n_bits += frame_bits
+            
+            # Decode the header, then the metadata, exactly once each as soon as their bits are
+            # in (usually both after the first frame), then stop once the whole payload is read
+            if metadata_end is None and n_bits >= header_bits:
+                header = np.packbits(bits[:header_bits]).tobytes()
+                if not header.startswith(magic):
+                    print(f"[VideoStego] Invalid magic header")
+                    return None
+                metadata_end = header_bits + struct.unpack('<I', header[len(magic):])[0] * 8
+            
+            if needed_bits is None and metadata_end is not None and n_bits >= metadata_end:
+                try:
+                    metadata = json.loads(np.packbits(bits[header_bits:metadata_end]).tobytes().decode('utf-8'))
+                    needed_bits = metadata_end + int(metadata['size']) * 8
+                except (ValueError, KeyError, TypeError):
+                    needed_bits = n_bits  # Reported by the metadata parse below
+            
+            if needed_bits is not None and n_bits >= needed_bits:
+                break
+        
+        # Convert bits to bytes (trailing partial byte dropped)
+        extracted_bytes = bytearray(np.packbits(bits[:n_bits // 8 * 8]).tobytes())
         
         # Verify magic header
-        magic = b'VEILFORGE_VIDEO_V1'
         if not extracted_bytes.startswith(magic):
             print(f"[VideoStego] Invalid magic header")
             return None
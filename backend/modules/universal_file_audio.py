@@ -195,7 +195,7 @@ class UniversalFileAudio:
         coeffs = pywt.wavedec(segment, self.wavelet, level=self.level)
         
         # Convert to bits
-        data_bits = ''.join(format(byte, '08b') for byte in total_package)
+        data_bits = np.unpackbits(np.frombuffer(total_package, dtype=np.uint8))
         print(f"🔢 Embedding {len(total_package)} bytes ({len(data_bits)} bits)")
         
         # Distribute across bands with robust embedding
@@ -225,9 +225,7 @@ class UniversalFileAudio:
             print(f"🔊 Band {band}: {len(detail_band)} coeffs, embedding {len(band_data)} bits")
             
             # Embed in this band using robust approach
-            for bit_idx, bit_char in enumerate(band_data):
-                bit_val = int(bit_char)
-                
+            for bit_idx, bit_val in enumerate(band_data):
                 # Use spacing of 4 for robustness
                 coeff_idx = bit_idx * 4
                 if coeff_idx < len(detail_band):
@@ -558,7 +556,7 @@ class UniversalFileAudio:
             detail_band = coeffs[target_band].copy()
             
             # Convert payload to bits
-            data_bits = ''.join(format(byte, '08b') for byte in payload)
+            data_bits = np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
             print(f"[SIMPLE AUDIO] Embedding {len(data_bits)} bits in band {target_band} (middle segment)")
             
             # CRITICAL FIX: Use adaptive spacing based on available space
@@ -576,8 +574,7 @@ class UniversalFileAudio:
             if required_coeffs > len(detail_band):
                 raise ValueError(f"Insufficient capacity: need {required_coeffs} coefficients, have {len(detail_band)}")
             
-            for bit_idx, bit_char in enumerate(data_bits):
-                bit_val = int(bit_char)
+            for bit_idx, bit_val in enumerate(data_bits):
                 coeff_idx = offset + (bit_idx * spacing)
                 
                 if coeff_idx < len(detail_band):